@@ -14,12 +14,18 @@ from .core.transforms import OpenToQ
 from .core.interfaces import (
     Answer,
     Answerer,
+    AsyncAnswerer,
+    BatchAnswerer,
+    CoalescingAnswerer,
     Collapser,
+    MemoAnswerer,
     QuestionDecomposer,
     Normalizer,
 )
 from .core.consistency import (
     run_consistency_check,
+    run_consistency_check_async,
+    run_consistency_check_cached,
     run_consistency_check_from_question,
 )
 
@@ -32,10 +38,16 @@ __all__ = [
     # Interfaces
     "Answer",
     "Answerer",
+    "AsyncAnswerer",
+    "BatchAnswerer",
+    "CoalescingAnswerer",
     "Collapser",
+    "MemoAnswerer",
     "QuestionDecomposer",
     "Normalizer",
     # Entrypoints
     "run_consistency_check",
+    "run_consistency_check_async",
+    "run_consistency_check_cached",
     "run_consistency_check_from_question",
 ]
\ No newline at end of file
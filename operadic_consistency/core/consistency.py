@@ -22,11 +22,25 @@
 # %autoreload 2
 
 # %%
+import asyncio
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Mapping, MutableMapping, Optional, Sequence, Dict, List
+from hashlib import blake2b
+from typing import Any, Callable, Iterator, Mapping, MutableMapping, Optional, Sequence, Dict, List, Tuple
 
 from operadic_consistency.core.toq_types import ToQ, NodeId, OpenToQ
-from operadic_consistency.core.interfaces import Answer, Answerer, Collapser, Normalizer, QuestionDecomposer
+from operadic_consistency.core.interfaces import (
+    Answer,
+    Answerer,
+    AsyncAnswerer,
+    Collapser,
+    MemoAnswerer,
+    Normalizer,
+    QuestionDecomposer,
+)
 from operadic_consistency.core.transforms import (
     CollapsePlan,
     CollapsedToQ,
@@ -35,7 +49,12 @@ from operadic_consistency.core.transforms import (
     apply_collapse_plan,
     extract_open_toq
 )
-from operadic_consistency.core.evaluate import EvalTrace, Substituter, evaluate_toq
+from operadic_consistency.core.evaluate import (
+    EvalTrace,
+    Substituter,
+    evaluate_toq,
+    evaluate_toq_async,
+)
 
 
 # %%
@@ -51,11 +70,101 @@ class RunRecord:
 
 @dataclass(frozen=True)
 class ConsistencyReport:
+    # Full results of the consistency check, stored columnar: one parallel
+    # list per field instead of 2^E nested RunRecord objects. Metrics passes
+    # (voting, distributions) scan a flat list of root answers; `runs` is a
+    # lazily-built compatibility view for per-run consumers.
     base_trace: EvalTrace
     base_root_answer: Answer
-    runs: Sequence[RunRecord]
+    plans: Sequence[CollapsePlan]
+    collapsed: Sequence[CollapsedToQ]
+    traces: Sequence[EvalTrace]
+    root_answers: Sequence[Answer]
+    normalized_roots: Sequence[Optional[str]]
     summary: Mapping[str, Any]
-    # Full results of the consistency check
+
+    @property
+    def runs(self) -> Sequence[RunRecord]:
+        # Materialized once on first access; the columns stay canonical.
+        cached = self.__dict__.get("_runs")
+        if cached is not None:
+            return cached
+
+        runs = tuple(
+            RunRecord(
+                plan=plan,
+                collapsed=collapsed,
+                trace=trace,
+                root_answer=root_answer,
+                normalized_root=normalized,
+            )
+            for plan, collapsed, trace, root_answer, normalized in zip(
+                self.plans,
+                self.collapsed,
+                self.traces,
+                self.root_answers,
+                self.normalized_roots,
+            )
+        )
+        object.__setattr__(self, "_runs", runs)
+        return runs
+
+
+def _iter_collapsed_plans(
+    toq: ToQ,
+    plans: Sequence[CollapsePlan],
+    *,
+    collapser: Collapser,
+    context: Optional[str],
+    cache: MutableMapping[bytes, str],
+) -> Iterator[Tuple[CollapsePlan, CollapsedToQ]]:
+    """
+    For each plan, extract the components as OpenToQs, collapse them to
+    single questions (cached by frontier), and build the quotient ToQ.
+    Yields lazily so drivers can stream plans and terminate early.
+    Shared by the sync and async drivers.
+    """
+    for plan in plans:
+        roots = component_roots(toq, plan)
+
+        open_toq_by_root: Dict[NodeId, OpenToQ] = {}
+        collapsed_question_by_root: Dict[NodeId, str] = {}
+
+        for r in roots:
+            open_toq = extract_open_toq(toq, plan, root=r)
+            open_toq_by_root[r] = open_toq
+
+            # Content-addressed: plans that carve out identical components
+            # (same node texts, structure, and inputs) share one entry.
+            cache_key = open_toq.signature()
+
+            if cache_key in cache:
+                cq = cache[cache_key]
+            else:
+                cq = collapser(open_toq, context=context)
+                cache[cache_key] = cq
+
+            collapsed_question_by_root[r] = cq
+
+        collapsed = apply_collapse_plan(
+            toq,
+            plan,
+            collapsed_question_by_root,
+        )
+
+        # Attach provenance if supported
+        if hasattr(collapsed, "open_toq_by_root"):
+            collapsed = CollapsedToQ(
+                toq=collapsed.toq,
+                plan=collapsed.plan,
+                removed_nodes=collapsed.removed_nodes,
+                collapsed_question_by_root=collapsed.collapsed_question_by_root,
+                component_roots=collapsed.component_roots,
+                open_toq_by_root=open_toq_by_root,
+                removed_mask=collapsed.removed_mask,
+            )
+
+        yield (plan, collapsed)
 
 
 def run_consistency_check(
@@ -67,7 +176,11 @@ def run_consistency_check(
     substituter: Optional[Substituter] = None,
     context: Optional[str] = None,
     plan_opts: Optional[Mapping[str, Any]] = None,
-    cache: Optional[MutableMapping[tuple, str]] = None,
+    cache: Optional[MutableMapping[bytes, str]] = None,
+    subtree_cache: Optional[MutableMapping[Tuple[Optional[str], str], Answer]] = None,
+    memoize_answers: bool = False,
+    max_workers: Optional[int] = None,
+    early_stop: Optional[Callable[[RunRecord], bool]] = None,
 ) -> ConsistencyReport:
     """
     Run the operadic consistency check on a given ToQ:
@@ -78,8 +191,41 @@ def run_consistency_check(
          - Collapse each OpenToQ to a single question (cached by interface)
          - Build quotient ToQ
          - Evaluate quotient
+
+    If max_workers > 1, the per-plan evaluations are dispatched to a bounded
+    thread pool. This workload is answerer-latency-bound for LLM-backed
+    answerers, so overlapping the network round-trips cuts wall-clock nearly
+    linearly (the answerer must be safe to call from multiple threads).
+    Collapser calls stay sequential so `cache` needs no locking.
+
+    If early_stop is given, plans are streamed one at a time and the sweep
+    stops after the first run for which early_stop(run) is True -- useful
+    when only checking whether *any* plan disagrees with the baseline.
+    Only supported for sequential evaluation.
+
+    If subtree_cache is given, it is shared by the baseline and every
+    per-plan evaluation: quotients that leave a subtree untouched render
+    the same questions there, so only the first plan to reach a subtree
+    pays for its answers (opt in -- skip it when answerer output is
+    non-deterministic and fresh samples are wanted). Plain dicts race
+    under the thread pool, so this combination is rejected like
+    early_stop is.
+
+    memoize_answers=True wraps the answerer in a MemoAnswerer for the
+    duration of the check, so each distinct (context, question) pair costs
+    one answerer call across the baseline and all 2^E plans (the memo is
+    lock-guarded, so this composes with max_workers). Only sound for
+    deterministic answerers.
     """
 
+    if early_stop is not None and max_workers is not None and max_workers > 1:
+        raise ValueError("early_stop requires sequential evaluation (max_workers <= 1)")
+    if subtree_cache is not None and max_workers is not None and max_workers > 1:
+        raise ValueError("subtree_cache requires sequential evaluation (max_workers <= 1)")
+
+    if memoize_answers:
+        answerer = MemoAnswerer(answerer)
+
     toq.validate()
 
     # -------------------------
@@ -90,6 +236,7 @@ def run_consistency_check(
         answerer=answerer,
         substituter=substituter,
         context=context,
+        subtree_cache=subtree_cache,
     )
     base_root_answer = base_trace.answer[toq.root_id]
 
@@ -100,79 +247,267 @@ def run_consistency_check(
     plans = enumerate_collapse_plans(toq, include_empty=include_empty)
 
     if cache is None:
+        # Fresh per call: signature keys identify component *content* only,
+        # not the collapser that produced the question, so a cache may only
+        # be shared across calls (or collapsers) by explicit opt-in.
         cache = {}
 
-    runs: List[RunRecord] = []
+    plans_col: List[CollapsePlan] = []
+    collapsed_col: List[CollapsedToQ] = []
+    traces_col: List[EvalTrace] = []
+    root_answers_col: List[Answer] = []
+    normalized_col: List[Optional[str]] = []
 
-    # -------------------------
-    # Iterate collapse plans
-    # -------------------------
-    for plan in plans:
-        roots = component_roots(toq, plan)
+    # Collapsed ToQs are produced lazily; collapser calls are cached.
+    collapsed_iter = _iter_collapsed_plans(
+        toq,
+        plans,
+        collapser=collapser,
+        context=context,
+        cache=cache,
+    )
 
-        open_toq_by_root: Dict[NodeId, OpenToQ] = {}
-        collapsed_question_by_root: Dict[NodeId, str] = {}
+    def _evaluate(collapsed: CollapsedToQ) -> EvalTrace:
+        return evaluate_toq(
+            collapsed.toq,
+            answerer=answerer,
+            substituter=substituter,
+            context=context,
+            subtree_cache=subtree_cache,
+        )
 
-        for r in roots:
-            open_toq = extract_open_toq(toq, plan, root=r)
-            open_toq_by_root[r] = open_toq
+    def _append(plan: CollapsePlan, collapsed: CollapsedToQ, trace: EvalTrace) -> Tuple[Answer, Optional[str]]:
+        root_answer = trace.answer[collapsed.toq.root_id]
+        normalized = (
+            normalizer(root_answer.text) if normalizer is not None else None
+        )
+        plans_col.append(plan)
+        collapsed_col.append(collapsed)
+        traces_col.append(trace)
+        root_answers_col.append(root_answer)
+        normalized_col.append(normalized)
+        return root_answer, normalized
+
+    if max_workers is not None and max_workers > 1:
+        # Parallel path: materialize the prepared plans, then fan out
+        prepared = list(collapsed_iter)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            traces = list(pool.map(_evaluate, [c for _, c in prepared]))
+        for (plan, collapsed), trace in zip(prepared, traces):
+            _append(plan, collapsed, trace)
+    else:
+        # Sequential path: stream plans, optionally stopping early
+        for plan, collapsed in collapsed_iter:
+            trace = _evaluate(collapsed)
+            root_answer, normalized = _append(plan, collapsed, trace)
+            if early_stop is not None and early_stop(
+                RunRecord(
+                    plan=plan,
+                    collapsed=collapsed,
+                    trace=trace,
+                    root_answer=root_answer,
+                    normalized_root=normalized,
+                )
+            ):
+                break
+
+    return ConsistencyReport(
+        base_trace=base_trace,
+        base_root_answer=base_root_answer,
+        plans=plans_col,
+        collapsed=collapsed_col,
+        traces=traces_col,
+        root_answers=root_answers_col,
+        normalized_roots=normalized_col,
+        summary={},  # metrics layer fills this later
+    )
 
-            cache_key = ("collapsed_question_open_toq", r, open_toq.inputs)
+def _report_cache_path(
+    cache_dir: str,
+    toq: ToQ,
+    tag: str,
+    include_empty: bool,
+    context: Optional[str],
+) -> str:
+    # Content-addressed filename: the serialized tree plus the answerer tag,
+    # plan options, and context. Context is input data (it changes the
+    # answers), so it must be part of the fingerprint. Any change to node
+    # texts, structure, options, or context yields a cache miss.
+    from operadic_consistency.core.serialization import toq_to_bytes
+
+    h = blake2b(digest_size=16)
+    h.update(toq_to_bytes(toq))
+    h.update(b"|" + tag.encode("utf-8"))
+    h.update(b"|empty" if include_empty else b"|noempty")
+    h.update(b"|nocontext" if context is None else b"|ctx:" + context.encode("utf-8"))
+    return os.path.join(cache_dir, f"{h.hexdigest()}-{tag}.pkl")
+
+
+def run_consistency_check_cached(
+    toq: ToQ,
+    *,
+    answerer: Answerer,
+    collapser: Collapser,
+    tag: str = "default",
+    cache_dir: Optional[str] = None,
+    **kwargs: Any,
+) -> ConsistencyReport:
+    """
+    Disk-cached wrapper around run_consistency_check.
+
+    The sweep is deterministic in (toq, answerer, collapser, plan options),
+    so for deterministic answerers the full ConsistencyReport can be stored
+    once and re-read on later runs -- one file read instead of O(2^E)
+    answerer calls. The cache key covers the tree, plan options, and
+    `context` (input data); `tag` names everything else that shapes the
+    result -- answerer, collapser, and any normalizer/substituter passed in
+    kwargs -- and callers must change it whenever they change any of those,
+    since callables cannot be fingerprinted.
+
+    Reports are pickled (they hold nested dataclasses, traces, and
+    arbitrary Answer.meta payloads, which rules out a fixed-schema codec).
+    Only point cache_dir at directories you trust: unpickling executes
+    whatever the file says. Defaults to ~/.cache/operadic_consistency.
+    Corrupt or unreadable entries are treated as misses and overwritten.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(
+            os.path.expanduser("~"), ".cache", "operadic_consistency"
+        )
+    os.makedirs(cache_dir, exist_ok=True)
 
-            if cache_key in cache:
-                cq = cache[cache_key]
-            else:
-                cq = collapser(open_toq, context=context)
-                cache[cache_key] = cq
+    plan_opts = kwargs.get("plan_opts")
+    include_empty = True
+    if plan_opts is not None and "include_empty" in plan_opts:
+        include_empty = bool(plan_opts["include_empty"])
 
-            collapsed_question_by_root[r] = cq
+    path = _report_cache_path(
+        cache_dir, toq, tag, include_empty, kwargs.get("context")
+    )
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError):
+        pass
 
-        collapsed = apply_collapse_plan(
+    report = run_consistency_check(
+        toq,
+        answerer=answerer,
+        collapser=collapser,
+        **kwargs,
+    )
+
+    # Atomic write so a crashed run never leaves a truncated entry behind.
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(report, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Caching is best-effort: unpicklable Answer.meta payloads or disk
+        # errors must not fail a fully computed sweep.
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    return report
+
+
+async def run_consistency_check_async(
+    toq: ToQ,
+    *,
+    answerer: AsyncAnswerer,
+    collapser: Collapser,
+    normalizer: Optional[Normalizer] = None,
+    substituter: Optional[Substituter] = None,
+    context: Optional[str] = None,
+    plan_opts: Optional[Mapping[str, Any]] = None,
+    cache: Optional[MutableMapping[bytes, str]] = None,
+    max_inflight: int = 8,
+) -> ConsistencyReport:
+    """
+    Async variant of run_consistency_check.
+
+    The baseline evaluation and every per-plan evaluation share no data
+    dependencies, so all of them are scheduled concurrently with
+    asyncio.gather; an asyncio.Semaphore(max_inflight) bounds how many
+    tree evaluations are in flight at once. The collapser is still called
+    synchronously during the preparation pass, so `cache` needs no lock.
+    Wall-clock becomes ~max(slowest evaluation) instead of their sum.
+    """
+
+    toq.validate()
+
+    include_empty = True
+    if plan_opts is not None and "include_empty" in plan_opts:
+        include_empty = bool(plan_opts["include_empty"])
+
+    plans = enumerate_collapse_plans(toq, include_empty=include_empty)
+
+    if cache is None:
+        # Fresh per call: signature keys identify component *content* only,
+        # not the collapser that produced the question, so a cache may only
+        # be shared across calls (or collapsers) by explicit opt-in.
+        cache = {}
+
+    prepared = list(
+        _iter_collapsed_plans(
             toq,
-            plan,
-            collapsed_question_by_root,
+            plans,
+            collapser=collapser,
+            context=context,
+            cache=cache,
         )
+    )
 
-        # Attach provenance if supported
-        if hasattr(collapsed, "open_toq_by_root"):
-            collapsed = CollapsedToQ(
-                toq=collapsed.toq,
-                plan=collapsed.plan,
-                removed_nodes=collapsed.removed_nodes,
-                collapsed_question_by_root=collapsed.collapsed_question_by_root,
-                component_roots=collapsed.component_roots,
-                open_toq_by_root=open_toq_by_root,
+    sem = asyncio.Semaphore(max_inflight)
+
+    async def _eval(t: ToQ) -> EvalTrace:
+        async with sem:
+            return await evaluate_toq_async(
+                t,
+                answerer=answerer,
+                substituter=substituter,
+                context=context,
             )
 
-        trace = evaluate_toq(
-            collapsed.toq,
-            answerer=answerer,
-            substituter=substituter,
-            context=context,
-        )
+    results = await asyncio.gather(
+        _eval(toq),
+        *(_eval(collapsed.toq) for _, collapsed in prepared),
+    )
+    base_trace = results[0]
+    base_root_answer = base_trace.answer[toq.root_id]
+
+    plans_col: List[CollapsePlan] = []
+    collapsed_col: List[CollapsedToQ] = []
+    traces_col: List[EvalTrace] = []
+    root_answers_col: List[Answer] = []
+    normalized_col: List[Optional[str]] = []
 
+    for (plan, collapsed), trace in zip(prepared, results[1:]):
         root_answer = trace.answer[collapsed.toq.root_id]
         normalized = (
             normalizer(root_answer.text) if normalizer is not None else None
         )
-
-        runs.append(
-            RunRecord(
-                plan=plan,
-                collapsed=collapsed,
-                trace=trace,
-                root_answer=root_answer,
-                normalized_root=normalized,
-            )
-        )
+        plans_col.append(plan)
+        collapsed_col.append(collapsed)
+        traces_col.append(trace)
+        root_answers_col.append(root_answer)
+        normalized_col.append(normalized)
 
     return ConsistencyReport(
         base_trace=base_trace,
         base_root_answer=base_root_answer,
-        runs=runs,
+        plans=plans_col,
+        collapsed=collapsed_col,
+        traces=traces_col,
+        root_answers=root_answers_col,
+        normalized_roots=normalized_col,
         summary={},  # metrics layer fills this later
     )
 
+
 def run_consistency_check_from_question(
     question: str,
     *,
@@ -183,7 +518,8 @@ def run_consistency_check_from_question(
     substituter: Optional[Substituter] = None,
     context: Optional[str] = None,
     plan_opts: Optional[Mapping[str, Any]] = None,
-    cache: Optional[MutableMapping[tuple, str]] = None,
+    cache: Optional[MutableMapping[bytes, str]] = None,
+    max_workers: Optional[int] = None,
 ) -> ConsistencyReport:
     """
     End-to-end entry point:
@@ -202,6 +538,7 @@ def run_consistency_check_from_question(
         context=context,
         plan_opts=plan_opts,
         cache=cache,
+        max_workers=max_workers,
     )
 
 # %%
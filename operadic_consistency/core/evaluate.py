@@ -22,11 +22,13 @@
 # %autoreload 2
 
 # %%
+import asyncio
+import sys
 from dataclasses import dataclass
-from typing import Dict, Mapping, Optional, Protocol, List
+from typing import Dict, Mapping, MutableMapping, Optional, Protocol, List, Sequence, Tuple
 
-from operadic_consistency.core.toq_types import ToQ, NodeId
-from operadic_consistency.core.interfaces import Answer, Answerer
+from operadic_consistency.core.toq_types import ToQ, NodeId, _PLACEHOLDER_RE
+from operadic_consistency.core.interfaces import Answer, Answerer, AsyncAnswerer
 
 
 # %%
@@ -50,28 +52,42 @@ def default_substituter(template: str, child_answers: Mapping[NodeId, str]) -> s
     Default convention: child answers are referenced as [A<child_id>].
     Example: "Which is bigger, [A1] or [A2]?"
     """
-    out = template
-    for cid, ans in child_answers.items():
-        out = out.replace(f"[A{cid}]", ans)
-    return out
-
-
-def _postorder(toq: ToQ) -> List[NodeId]:
+    # Cheap C-level probe first: no "[" means no placeholder, so skip the
+    # regex machinery entirely -- the common case for leaf-like templates.
+    if "[" not in template:
+        return template
+    # One compiled-regex pass over the template instead of one full
+    # str.replace scan per child; placeholders for unknown ids are left as-is.
+    return _PLACEHOLDER_RE.sub(
+        lambda m: child_answers.get(int(m.group(1)), m.group(0)),
+        template,
+    )
+
+
+def _postorder(toq: ToQ) -> Sequence[NodeId]:
     """Return node ids in postorder (children before parent), starting at root."""
-    ch = toq.children()
-    order: List[NodeId] = []
-    visited = set()
+    # Delegates to the cached traversal on ToQ; kept as a local alias since
+    # evaluation is its main consumer.
+    return toq.postorder()
 
-    def dfs(n: NodeId) -> None:
-        if n in visited:
-            return
-        visited.add(n)
-        for c in ch.get(n, []):
-            dfs(c)
-        order.append(n)
 
-    dfs(toq.root_id)
-    return order
+def _waves(toq: ToQ) -> List[List[NodeId]]:
+    """
+    Bucket nodes into dependency "waves": leaves are wave 0, and an internal
+    node sits one wave above its deepest child. Nodes within a wave have no
+    unresolved dependencies on each other, so they can be answered together.
+    """
+    ch = toq.children()
+    level: Dict[NodeId, int] = {}
+    waves: List[List[NodeId]] = []
+    for nid in _postorder(toq):
+        child_ids = ch.get(nid, [])
+        lvl = 0 if len(child_ids) == 0 else 1 + max(level[c] for c in child_ids)
+        level[nid] = lvl
+        while lvl >= len(waves):
+            waves.append([])
+        waves[lvl].append(nid)
+    return waves
 
 
 def evaluate_toq(
@@ -80,37 +96,134 @@ def evaluate_toq(
     answerer: Answerer,
     substituter: Optional[Substituter] = None,
     context: Optional[str] = None,
+    subtree_cache: Optional[MutableMapping[Tuple[Optional[str], str], Answer]] = None,
 ) -> EvalTrace:
     # Evaluate a ToQ leaves->root by repeatedly answering questions
+    #
+    # subtree_cache, if given, memoizes (context, rendered question) -> Answer.
+    # A rendered question embeds the child answers of its whole subtree, so
+    # two collapse plans whose quotients share an untouched subtree render
+    # identical questions there -- the second plan reuses the cached answers
+    # without touching the answerer.
 
     toq.validate()
     sub = substituter or default_substituter
 
+    # Under the default [A<id>] convention, templates without a placeholder
+    # cannot change under substitution, so skip the call outright. Custom
+    # substituters may combine child answers however they like, so they are
+    # always invoked.
+    flags = toq.placeholder_flags() if substituter is None else None
+
     ch = toq.children()
-    order = _postorder(toq)
+
+    # A BatchAnswerer can answer a whole wave in one round-trip
+    # (O(depth) round-trips instead of O(N)).
+    waves = _waves(toq)
 
     rendered: Dict[NodeId, str] = {}
     answers: Dict[NodeId, Answer] = {}
 
-    for nid in order:
-        template = toq.nodes[nid].text
-        child_ids = ch.get(nid, [])
+    batch = getattr(answerer, "batch", None)
+
+    for wave in waves:
+        # Render every question in the wave first (child answers are all
+        # available from earlier waves).
+        qs: List[str] = []
+        for nid in wave:
+            template = toq.nodes[nid].text
+            child_ids = ch.get(nid, [])
+
+            # Render question at this node:
+            # - leaves (and placeholder-free templates on the default
+            #   substituter path): ask template as-is
+            # - internal nodes: apply substituter to child answers
+            if len(child_ids) == 0 or (flags is not None and not flags[nid]):
+                q = template
+            else:
+                # Gather child answers (text only) for substitution
+                child_ans_text: Dict[NodeId, str] = {cid: answers[cid].text for cid in child_ids}
+                q = sub(template, child_ans_text)
+
+            # Intern: identical rendered questions recur across collapse
+            # plans, so caches and traces share one string object and get
+            # pointer-equality fast paths on hashing/comparison.
+            q = sys.intern(q)
+
+            rendered[nid] = q
+            qs.append(q)
+
+        # Resolve cache hits first; only misses reach the answerer
+        if subtree_cache is not None:
+            misses: List[Tuple[NodeId, str]] = []
+            for nid, q in zip(wave, qs):
+                hit = subtree_cache.get((context, q))
+                if hit is not None:
+                    answers[nid] = hit
+                else:
+                    misses.append((nid, q))
+        else:
+            misses = list(zip(wave, qs))
+
+        # Ask model: one batched call per wave if supported, else per node
+        if batch is not None and misses:
+            miss_answers = batch([q for _, q in misses], context=context)
+            for (nid, q), ans in zip(misses, miss_answers):
+                answers[nid] = ans
+                if subtree_cache is not None:
+                    subtree_cache[(context, q)] = ans
+        else:
+            for nid, q in misses:
+                ans = answerer(q, context=context)
+                answers[nid] = ans
+                if subtree_cache is not None:
+                    subtree_cache[(context, q)] = ans
 
-        # Gather child answers (text only) for substitution
-        child_ans_text: Dict[NodeId, str] = {cid: answers[cid].text for cid in child_ids}
+    return EvalTrace(rendered_question=rendered, answer=answers)
 
-        # Render question at this node:
-        # - leaves: ask template as-is
-        # - internal nodes: apply substituter
-        if len(child_ids) == 0:
-            q = template
-        else:
-            q = sub(template, child_ans_text)
 
-        rendered[nid] = q
+async def evaluate_toq_async(
+    toq: ToQ,
+    *,
+    answerer: AsyncAnswerer,
+    substituter: Optional[Substituter] = None,
+    context: Optional[str] = None,
+) -> EvalTrace:
+    # Async counterpart of evaluate_toq: questions within a wave share no
+    # dependencies, so each wave is dispatched concurrently with
+    # asyncio.gather and round-trips overlap across siblings.
+
+    toq.validate()
+    sub = substituter or default_substituter
+    flags = toq.placeholder_flags() if substituter is None else None
+
+    ch = toq.children()
+    waves = _waves(toq)
+
+    rendered: Dict[NodeId, str] = {}
+    answers: Dict[NodeId, Answer] = {}
 
-        # Ask model
-        answers[nid] = answerer(q, context=context)
+    for wave in waves:
+        qs: List[str] = []
+        for nid in wave:
+            template = toq.nodes[nid].text
+            child_ids = ch.get(nid, [])
+
+            if len(child_ids) == 0 or (flags is not None and not flags[nid]):
+                q = template
+            else:
+                child_ans_text: Dict[NodeId, str] = {cid: answers[cid].text for cid in child_ids}
+                q = sub(template, child_ans_text)
+
+            q = sys.intern(q)
+            rendered[nid] = q
+            qs.append(q)
+
+        wave_answers = await asyncio.gather(
+            *(answerer(q, context=context) for q in qs)
+        )
+        for nid, ans in zip(wave, wave_answers):
+            answers[nid] = ans
 
     return EvalTrace(rendered_question=rendered, answer=answers)
 
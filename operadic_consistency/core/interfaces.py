@@ -22,8 +22,15 @@
 # %autoreload 2
 
 # %%
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from weakref import WeakValueDictionary
 from dataclasses import dataclass
-from typing import Any, Mapping, Optional, Protocol
+from typing import Any, Dict, Mapping, Optional, Protocol, Sequence
 
 from operadic_consistency.core.toq_types import ToQ, OpenToQ
 
@@ -35,11 +42,53 @@ class Answer:
     meta: Optional[Mapping[str, Any]] = None
     # Raw model answer plus optional metadata (logprobs, tokens, etc.)
 
+    def __post_init__(self):
+        # Equal answer texts recur across the 2^E runs of a sweep and are
+        # used as dict/Counter keys throughout metrics; interning gives them
+        # pointer-equality fast paths and one shared heap copy. Guarded so
+        # non-str payloads and pathological lengths pass through untouched.
+        if isinstance(self.text, str) and len(self.text) <= 4096:
+            object.__setattr__(self, "text", sys.intern(self.text))
+
+    @classmethod
+    def flyweight(cls, text: str, meta: Optional[Mapping[str, Any]] = None) -> "Answer":
+        """
+        Return a pooled Answer for meta-free payloads: equal texts share one
+        instance (weakly held, so the pool never outlives its answers).
+        Answerers returning the same few distinct answers across thousands
+        of runs can use this to collapse allocations and give Counter/dict
+        consumers identity-hit fast paths. Answers carrying meta are never
+        pooled -- meta differs per call even when text collides.
+        """
+        if meta is not None:
+            return cls(text=text, meta=meta)
+        ans = _ANSWER_POOL.get(text)
+        if ans is None:
+            ans = cls(text=text)
+            _ANSWER_POOL[text] = ans
+        return ans
+
+
+_ANSWER_POOL: "WeakValueDictionary[str, Answer]" = WeakValueDictionary()
+
+
 class Answerer(Protocol):
     def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
         # Given a fully-instantiated question, return a model answer
         ...
 
+class AsyncAnswerer(Protocol):
+    async def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
+        # Async counterpart of Answerer, for overlapping network round-trips
+        ...
+
+class BatchAnswerer(Protocol):
+    def batch(self, questions: Sequence[str], *, context: Optional[str] = None) -> Sequence[Answer]:
+        # Answer several independent questions in one call, preserving order.
+        # Answerers may implement this to exploit provider-side batching;
+        # evaluate_toq uses it when present and falls back to __call__ otherwise.
+        ...
+
 class Collapser(Protocol):
     def __call__(self, open_toq: OpenToQ, *, context: Optional[str] = None) -> str:
         # Given an open ToQ, produce a single question summarizing it.
@@ -51,6 +100,134 @@ class Normalizer(Protocol):
         # Map semantically equivalent answers to a canonical form
         ...
 
+class MemoAnswerer:
+    """
+    Wrap an Answerer with an LRU memo keyed on (context, question).
+
+    Across the many collapse plans enumerated in a consistency check, the
+    same rendered question is re-asked verbatim (e.g. every plan that does
+    not touch a given leaf re-asks that leaf). Memoizing turns each repeat
+    into a dict lookup instead of another answerer round-trip. Only suitable
+    for deterministic answerers (e.g. temperature-0 LLM calls).
+
+    If persist_path is given, the memo is write-through to a JSONL file:
+    entries are loaded at construction and each miss is appended, so paid-for
+    answers survive across runs (grid searches, retries, notebooks). Only
+    answer text round-trips; Answer.meta is not persisted, so reloaded hits
+    carry meta=None.
+
+    Memo bookkeeping is guarded by a lock, so one instance can be shared
+    across pool threads (run_consistency_check with memoize_answers and
+    max_workers > 1). The wrapped answerer is called outside the lock;
+    concurrent misses on the same key may each call it once -- compose with
+    CoalescingAnswerer to collapse in-flight duplicates.
+    """
+
+    def __init__(
+        self,
+        answerer: Answerer,
+        *,
+        maxsize: Optional[int] = 4096,
+        persist_path: Optional[str] = None,
+    ):
+        self._answerer = answerer
+        self._maxsize = maxsize
+        self._memo: "OrderedDict[tuple, Answer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._persist_path = persist_path
+        if persist_path is not None and os.path.exists(persist_path):
+            with open(persist_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    self._memo[(entry["context"], entry["question"])] = Answer(
+                        text=entry["text"]
+                    )
+
+    def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
+        key = (context, question)
+
+        with self._lock:
+            hit = self._memo.get(key)
+            if hit is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return hit
+            self.misses += 1
+
+        ans = self._answerer(question, context=context)
+
+        with self._lock:
+            self._memo[key] = ans
+            if self._maxsize is not None and len(self._memo) > self._maxsize:
+                self._memo.popitem(last=False)
+
+            if self._persist_path is not None:
+                entry = {"context": context, "question": question, "text": ans.text}
+                with open(self._persist_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+        return ans
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class CoalescingAnswerer:
+    """
+    Wrap an Answerer so concurrent duplicate requests share one call.
+
+    A memo only helps once the first answer has returned; under
+    run_consistency_check(max_workers=N) several threads can be asking the
+    same rendered question at the same moment, each paying a full
+    round-trip. This wrapper keys in-flight calls on (context, question):
+    the first caller computes, later callers block on the same Future and
+    share its result (or its exception). Composes with MemoAnswerer --
+    coalescing covers in-flight duplicates, the memo covers finished ones.
+    """
+
+    def __init__(self, answerer: Answerer):
+        self._answerer = answerer
+        self._lock = threading.Lock()
+        self._inflight: "Dict[tuple, Future]" = {}
+        self.coalesced = 0  # calls that piggybacked on an in-flight request
+
+    def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
+        key = (context, question)
+
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return fut.result()
+
+        try:
+            ans = self._answerer(question, context=context)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(ans)
+            return ans
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
 class QuestionDecomposer(Protocol):
     def __call__(self, question: str, *, context: Optional[str] = None) -> ToQ:
         """
@@ -23,7 +23,7 @@
 
 # %%
 from collections import Counter
-from math import log
+from math import fsum, log
 from typing import Any, Dict, Mapping, Sequence, Tuple, List, Optional
 
 from operadic_consistency.core.consistency import ConsistencyReport
@@ -35,6 +35,15 @@ def _answer_key(text: str) -> str:
     # Default fallback key if no normalizer is used; keep simple.
     return text
 
+def _run_keys(report: ConsistencyReport, use_normalized: bool):
+    # Yield the histogram key for each run without building an intermediate
+    # list; Counter consumes this at C speed.
+    for r in report.runs:
+        if use_normalized and r.normalized_root is not None:
+            yield r.normalized_root
+        else:
+            yield _answer_key(r.root_answer.text)
+
 def answer_distribution(
     report: ConsistencyReport,
     *,
@@ -44,13 +53,7 @@ def answer_distribution(
     Histogram of root answers across runs.
     If use_normalized=True and normalized_root is present, use that; otherwise use raw text.
     """
-    keys: List[str] = []
-    for r in report.runs:
-        if use_normalized and r.normalized_root is not None:
-            keys.append(r.normalized_root)
-        else:
-            keys.append(_answer_key(r.root_answer.text))
-    return dict(Counter(keys))
+    return dict(Counter(_run_keys(report, use_normalized)))
 
 def mode_answer(
     report: ConsistencyReport,
@@ -58,11 +61,8 @@ def mode_answer(
     use_normalized: bool = True,
 ) -> Optional[Tuple[str, int]]:
     """Return (most_common_answer, count), or None if no runs."""
-    dist = answer_distribution(report, use_normalized=use_normalized)
-    if not dist:
-        return None
-    k = max(dist, key=lambda x: dist[x])
-    return (k, dist[k])
+    top = Counter(_run_keys(report, use_normalized)).most_common(1)
+    return top[0] if top else None
 
 def agreement_rate(
     report: ConsistencyReport,
@@ -73,12 +73,11 @@ def agreement_rate(
     Fraction of runs that equal the modal answer.
     Returns 0.0 if there are no runs.
     """
-    dist = answer_distribution(report, use_normalized=use_normalized)
-    n = sum(dist.values())
+    counts = Counter(_run_keys(report, use_normalized))
+    n = sum(counts.values())
     if n == 0:
         return 0.0
-    m = max(dist.values())
-    return m / n
+    return counts.most_common(1)[0][1] / n
 
 def shannon_entropy(dist: Mapping[str, int]) -> float:
     """
@@ -87,11 +86,10 @@ def shannon_entropy(dist: Mapping[str, int]) -> float:
     total = sum(dist.values())
     if total == 0:
         return 0.0
-    ent = 0.0
-    for c in dist.values():
-        p = c / total
-        ent -= p * log(p)
-    return ent
+    # -sum(p*log p) rewritten as log(T) - (1/T)*sum(c*log c): one division
+    # total instead of one per key, and fsum keeps the accumulation in a
+    # single compensated C-level pass. Zero counts contribute nothing.
+    return log(total) - fsum(c * log(c) for c in dist.values() if c) / total
 
 def inconsistency_witnesses(
     report: ConsistencyReport,
@@ -109,12 +107,35 @@ def inconsistency_witnesses(
         else:
             k = _answer_key(r.root_answer.text)
 
-        if k not in out:
-            out[k] = []
-        if len(out[k]) < max_per_answer:
-            out[k].append(r.plan)
+        # setdefault: one hash lookup to fetch-or-create the bucket, and
+        # full buckets are skipped without further work.
+        bucket = out.setdefault(k, [])
+        if len(bucket) < max_per_answer:
+            bucket.append(r.plan)
     return out
 
+def _single_pass(
+    report: ConsistencyReport,
+    use_normalized: bool,
+    max_per_answer: int,
+) -> Tuple[Counter, Dict[str, List[CollapsePlan]]]:
+    # Build the answer histogram and the witness buckets in one traversal
+    # of the runs; summarize_report derives every metric from these instead
+    # of re-walking the report once per metric.
+    counts: Counter = Counter()
+    witnesses: Dict[str, List[CollapsePlan]] = {}
+    for r in report.runs:
+        if use_normalized and r.normalized_root is not None:
+            k = r.normalized_root
+        else:
+            k = _answer_key(r.root_answer.text)
+
+        counts[k] += 1
+        bucket = witnesses.setdefault(k, [])
+        if len(bucket) < max_per_answer:
+            bucket.append(r.plan)
+    return counts, witnesses
+
 def summarize_report(
     report: ConsistencyReport,
     *,
@@ -130,19 +151,13 @@ def summarize_report(
       - top_k answers
       - witness plans
     """
-    dist = answer_distribution(report, use_normalized=use_normalized)
+    dist, witnesses = _single_pass(report, use_normalized, max_witnesses_per_answer)
     total = sum(dist.values())
 
-    top = Counter(dist).most_common(top_k)
+    top = dist.most_common(top_k)
     mode = top[0] if top else None
     mode_frac = (mode[1] / total) if mode and total > 0 else None
 
-    witnesses = inconsistency_witnesses(
-        report,
-        use_normalized=use_normalized,
-        max_per_answer=max_witnesses_per_answer,
-    )
-
     return {
         "num_runs": total,
         "num_unique_answers": len(dist),
@@ -22,8 +22,25 @@
 # %autoreload 2
 
 # %%
+import json
+import sys
 from typing import Any, Dict, Mapping
 
+try:
+    import orjson  # optional: ~3-5x faster encode/decode for bulk corpora
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: binary msgpack framing, denser and faster than JSON text.
+    # Encoder/decoder are built once at import and reused (constructing
+    # them per call forfeits most of msgspec's speed).
+    from msgspec import msgpack as _msgpack
+    _MSGPACK_ENCODER = _msgpack.Encoder()
+    _MSGPACK_DECODER = _msgpack.Decoder()
+except ImportError:
+    _msgpack = None
+
 from operadic_consistency.core.toq_types import ToQ, ToQNode, NodeId
 
 
@@ -102,9 +119,13 @@ def toq_from_json(obj: Mapping[str, Any]) -> ToQ:
             raise ValueError(f"Invalid node entry for id {nid}")
 
         try:
+            text = v["text"]
+            if isinstance(text, str):
+                # Dedupe repeated texts across bulk-loaded ToQs
+                text = sys.intern(text)
             node = ToQNode(
                 id=v["id"],
-                text=v["text"],
+                text=text,
                 parent=v.get("parent"),
             )
         except KeyError as e:
@@ -116,4 +137,60 @@ def toq_from_json(obj: Mapping[str, Any]) -> ToQ:
     toq.validate()
     return toq
 
+
+def toq_to_bytes(toq: ToQ) -> bytes:
+    """
+    Encode a ToQ straight to JSON bytes, using orjson when available
+    (stdlib json otherwise). Both produce the same compact wire format as
+    ``toq_to_json``, so the two paths are interchangeable.
+
+    Example:
+        >>> toq = ToQ(
+        ...     nodes={
+        ...         1: ToQNode(1, "When did WW2 end?", parent=2),
+        ...         2: ToQNode(2, "Who was President at time [A1]?", parent=None),
+        ...     },
+        ...     root_id=2,
+        ... )
+        >>> toq_from_bytes(toq_to_bytes(toq)) == toq
+        True
+    """
+    obj = toq_to_json(toq)
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def toq_from_bytes(buf: bytes) -> ToQ:
+    """
+    Decode JSON bytes produced by ``toq_to_bytes`` (or any toq_to_json-shaped
+    payload) into a validated ToQ. Same validation and text interning as
+    ``toq_from_json``; only the parse step differs.
+    """
+    obj = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    return toq_from_json(obj)
+
+
+def toq_to_msgpack(toq: ToQ) -> bytes:
+    """
+    Encode a ToQ to msgpack bytes. Requires the optional msgspec dependency;
+    raises RuntimeError with a clear message when it is missing. The payload
+    is the same shape as ``toq_to_json``, just framed as msgpack instead of
+    JSON text -- denser on disk and faster to round-trip for bulk corpora.
+    """
+    if _msgpack is None:
+        raise RuntimeError("toq_to_msgpack requires the optional 'msgspec' package")
+    return _MSGPACK_ENCODER.encode(toq_to_json(toq))
+
+
+def toq_from_msgpack(buf: bytes) -> ToQ:
+    """
+    Decode msgpack bytes produced by ``toq_to_msgpack`` into a validated
+    ToQ. Requires msgspec; validation and interning go through
+    ``toq_from_json`` as with the other decode paths.
+    """
+    if _msgpack is None:
+        raise RuntimeError("toq_from_msgpack requires the optional 'msgspec' package")
+    return toq_from_json(_MSGPACK_DECODER.decode(buf))
+
 # %%
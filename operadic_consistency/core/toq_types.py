@@ -22,25 +22,85 @@
 # %autoreload 2
 
 # %%
-from typing import Dict, List, Set, Optional, Mapping, Sequence
+import re
+import sys
+from hashlib import blake2b
+from typing import Dict, List, Set, Optional, Mapping, Sequence, Tuple
 from dataclasses import dataclass
 
 # %%
 NodeId = int  # unique identifier for a question node
 
+# Placeholder syntax for child answers in node templates: [A<child_id>]
+_PLACEHOLDER_RE = re.compile(r"\[A(\d+)\]")
+
 @dataclass(frozen=True)
 class ToQNode:
     id: NodeId
     text: str                  # question text at this node
     parent: Optional[NodeId]   # parent node id; None iff root
 
+    def __post_init__(self):
+        # Same node texts repeat across quotient ToQs and bulk-loaded
+        # corpora; intern so they share storage and hash/compare by pointer.
+        if isinstance(self.text, str) and len(self.text) <= 4096:
+            object.__setattr__(self, "text", sys.intern(self.text))
+
 @dataclass(frozen=True)
 class ToQ:
     nodes: Mapping[NodeId, ToQNode]
     root_id: NodeId
 
+    def _bitmaps(self) -> Tuple[Mapping[NodeId, int], Mapping[NodeId, int]]:
+        """
+        Bitset view of the tree, built once per instance:
+        (bit_of, subtree_mask). bit_of assigns each node a bit position;
+        subtree_mask[n] has the bits of n's whole subtree set (computed in
+        one postorder pass by OR-ing child masks). Python ints are
+        arbitrary-width, so this works past 64 nodes, and plan-sweep code
+        can test component membership with single AND/shift operations
+        instead of per-node set arithmetic.
+        """
+        cached = self.__dict__.get("_bitmaps_cache")
+        if cached is not None:
+            return cached
+
+        bit_of = {nid: i for i, nid in enumerate(self.nodes)}
+        ch = self.children()
+        masks: Dict[NodeId, int] = {}
+        for nid in self.postorder():
+            m = 1 << bit_of[nid]
+            for c in ch.get(nid, []):
+                m |= masks[c]
+            masks[nid] = m
+
+        cached = (bit_of, masks)
+        object.__setattr__(self, "_bitmaps_cache", cached)
+        return cached
+
+    def placeholder_flags(self) -> Mapping[NodeId, bool]:
+        # nid -> whether the node's template contains an [A...] placeholder.
+        # Node texts are static, so this is computed once; evaluation uses it
+        # to skip substitution entirely on placeholder-free templates.
+        cached = self.__dict__.get("_placeholder_flags")
+        if cached is not None:
+            return cached
+
+        flags = {
+            nid: _PLACEHOLDER_RE.search(node.text) is not None
+            for nid, node in self.nodes.items()
+        }
+        object.__setattr__(self, "_placeholder_flags", flags)
+        return flags
+
     def children(self) -> Mapping[NodeId, Sequence[NodeId]]:
-        # Return adjacency: node -> list of child node ids
+        # Return adjacency: node -> list of child node ids.
+        # A ToQ is immutable, so the adjacency is built once and cached;
+        # validate(), leaves(), and evaluation all reuse the same mapping.
+        cached = self.__dict__.get("_children")
+        if cached is not None:
+            return cached
+
         ch: Dict[NodeId, List[NodeId]] = {nid: [] for nid in self.nodes}
         for nid, node in self.nodes.items():
             p = node.parent
@@ -49,60 +109,132 @@ class ToQ:
                 # But we still guard to avoid KeyError in casual usage.
                 if p in ch:
                     ch[p].append(nid)
+
+        object.__setattr__(self, "_children", ch)
         return ch
 
+    def postorder(self) -> Sequence[NodeId]:
+        # Return node ids in postorder (children before parent), starting
+        # at root. Cached alongside children() since the tree is immutable.
+        cached = self.__dict__.get("_postorder")
+        if cached is not None:
+            return cached
+
+        ch = self.children()
+        order: List[NodeId] = []
+        visited: Set[NodeId] = set()
+
+        # Explicit stack instead of recursion: no RecursionError on deep
+        # decomposition chains, and no per-frame call overhead. A node is
+        # pushed once unprocessed and once more to be emitted postorder.
+        stack: List[tuple] = [(self.root_id, False)]
+        while stack:
+            n, processed = stack.pop()
+            if processed:
+                order.append(n)
+                continue
+            if n in visited:
+                continue
+            visited.add(n)
+            stack.append((n, True))
+            for c in reversed(ch.get(n, [])):
+                stack.append((c, False))
+
+        object.__setattr__(self, "_postorder", order)
+        return order
+
     def leaves(self) -> Sequence[NodeId]:
-        # Return all leaf nodes (nodes with no children)
+        # Return all leaf nodes (nodes with no children). Cached like
+        # children(): the tree is immutable, so the O(N) scan happens once
+        # and repeat callers get the stored list back.
+        cached = self.__dict__.get("_leaves")
+        if cached is not None:
+            return cached
+
         ch = self.children()
-        return [nid for nid in self.nodes if len(ch.get(nid, [])) == 0]
+        lv = [nid for nid in self.nodes if len(ch.get(nid, [])) == 0]
+        object.__setattr__(self, "_leaves", lv)
+        return lv
+
+    def sorted_ids(self) -> Sequence[NodeId]:
+        # Node ids in ascending order, sorted once per tree. Display code
+        # iterates this instead of re-sorting nodes.items() per call
+        # (pretty-printers run once per plan over the 2^E sweep).
+        cached = self.__dict__.get("_sorted_ids")
+        if cached is not None:
+            return cached
+
+        ids = sorted(self.nodes)
+        object.__setattr__(self, "_sorted_ids", ids)
+        return ids
 
     def validate(self) -> None:
         # Check tree well-formedness (unique root, no cycles, valid parents)
 
+        # A ToQ is immutable, so a successful validation holds forever.
+        # Remember it: the consistency driver and the transforms each call
+        # validate() defensively, and without this memo the same tree would
+        # be re-walked once per collapse plan.
+        if self.__dict__.get("_validated", False):
+            return
+
         if self.root_id not in self.nodes:
             raise ValueError(f"root_id {self.root_id} not in nodes")
 
-        # Check parent pointers refer to existing nodes and ids are consistent
+        # One fused pass over the nodes: id consistency, parent validity,
+        # and root collection together (previously separate scans).
+        roots: List[NodeId] = []
         for nid, node in self.nodes.items():
             if node.id != nid:
                 raise ValueError(f"Node key {nid} != node.id {node.id}")
-            if node.parent is not None and node.parent not in self.nodes:
-                raise ValueError(f"Node {nid} has missing parent {node.parent}")
-            if node.parent == nid:
-                raise ValueError(f"Node {nid} cannot be its own parent")
+            p = node.parent
+            if p is None:
+                roots.append(nid)
+            else:
+                if p not in self.nodes:
+                    raise ValueError(f"Node {nid} has missing parent {p}")
+                if p == nid:
+                    raise ValueError(f"Node {nid} cannot be its own parent")
 
         # Exactly one root: root_id must have parent None, and no other node may have parent None
         if self.nodes[self.root_id].parent is not None:
             raise ValueError(f"root_id {self.root_id} must have parent=None")
 
-        roots = [nid for nid, node in self.nodes.items() if node.parent is None]
         if len(roots) != 1:
             raise ValueError(f"Expected exactly 1 root, found {len(roots)}: {roots}")
         if roots[0] != self.root_id:
             raise ValueError(f"root_id {self.root_id} != the unique root {roots[0]}")
 
         # Detect cycles + ensure connectivity from root via DFS
+        # (iterative with an explicit stack, so deep ToQs cannot hit the
+        # interpreter recursion limit; a sentinel entry pops the node from
+        # in_stack once its subtree is done)
         ch = self.children()
         visited: Set[NodeId] = set()
         in_stack: Set[NodeId] = set()
 
-        def dfs(u: NodeId) -> None:
+        stack: List[tuple] = [(self.root_id, False)]
+        while stack:
+            u, done = stack.pop()
+            if done:
+                in_stack.remove(u)
+                continue
             visited.add(u)
             in_stack.add(u)
+            stack.append((u, True))
             for v in ch.get(u, []):
                 if v in in_stack:
                     raise ValueError(f"Cycle detected: edge {u} -> {v}")
                 if v not in visited:
-                    dfs(v)
-            in_stack.remove(u)
-
-        dfs(self.root_id)
+                    stack.append((v, False))
 
         # Ensure all nodes reachable (no orphan subtrees)
         if len(visited) != len(self.nodes):
             unreachable = sorted(set(self.nodes.keys()) - visited)
             raise ValueError(f"Unreachable nodes from root {self.root_id}: {unreachable}")
 
+        object.__setattr__(self, "_validated", True)
+
 @dataclass(frozen=True)
 class OpenToQ:
     """
@@ -116,4 +248,39 @@ class OpenToQ:
     inputs: tuple[NodeId, ...]
     root_id: NodeId
 
+    def input_set(self) -> "frozenset[NodeId]":
+        # Set view of `inputs`, built once per instance. Collapsers doing
+        # membership tests per node should use this instead of re-running
+        # set(open_toq.inputs) on every call; the tuple field stays canonical
+        # (ordered, hashable, stable for serialization).
+        cached = self.__dict__.get("_input_set")
+        if cached is not None:
+            return cached
+
+        s = frozenset(self.inputs)
+        object.__setattr__(self, "_input_set", s)
+        return s
+
+    def signature(self) -> bytes:
+        """
+        Content-addressed fingerprint of this OpenToQ (16-byte blake2b).
+
+        Hashes the component's node ids, texts, parent pointers, and the
+        external input tuple, so two OpenToQs with identical content hash
+        equal even when extracted by different collapse plans. Used as a
+        collapser-cache key; cached per instance since OpenToQs are frozen.
+        """
+        cached = self.__dict__.get("_signature")
+        if cached is not None:
+            return cached
+
+        h = blake2b(digest_size=16)
+        h.update(repr((self.root_id, self.inputs)).encode("utf-8"))
+        for nid in sorted(self.toq.nodes):
+            node = self.toq.nodes[nid]
+            h.update(f"|{nid}\x1f{node.parent}\x1f{node.text}".encode("utf-8"))
+        sig = h.digest()
+        object.__setattr__(self, "_signature", sig)
+        return sig
+
 # %%
@@ -22,9 +22,10 @@
 # %autoreload 2
 
 # %%
+from collections.abc import Sequence as _SequenceBase
 from dataclasses import dataclass
-from itertools import combinations
-from typing import Dict, List, Mapping, Sequence, Optional, Set, Tuple, FrozenSet
+from functools import lru_cache
+from typing import Dict, Iterator, Mapping, Sequence, Optional, Set, Tuple, FrozenSet
 
 from operadic_consistency.core.toq_types import ToQ, ToQNode, NodeId, OpenToQ
 
@@ -35,6 +36,94 @@ class CollapsePlan:
     cut_edges: tuple[NodeId, ...]
     # Each NodeId c represents cutting the edge parent(c) -> c (so c becomes a component root).
 
+    def cut_set(self) -> FrozenSet[NodeId]:
+        # Frozenset view of cut_edges, built once per plan. Every consumer
+        # of a plan needs membership tests; without this, each one re-ran
+        # set(plan.cut_edges) -- one allocation per consumer per plan
+        # across a 2^E sweep.
+        cached = self.__dict__.get("_cut_set")
+        if cached is not None:
+            return cached
+
+        s = frozenset(self.cut_edges)
+        object.__setattr__(self, "_cut_set", s)
+        return s
+
+    def node_set(self, root_id: NodeId) -> FrozenSet[NodeId]:
+        # Node set of the quotient ToQ this plan induces: the component
+        # roots, i.e. the cut edges plus the global root.
+        return self.cut_set() | {root_id}
+
+class _CollapsePlanSequence(_SequenceBase):
+    """
+    Lazy sequence of all collapse plans over a fixed edge set.
+
+    Behaves like the list it replaces (len, indexing, iteration, `in`), but
+    materializes each CollapsePlan on demand: enumerating a k-edge tree
+    holds O(1) plans in memory instead of 2^k, and downstream consumers can
+    terminate the sweep early without paying for the full enumeration.
+    """
+
+    def __init__(self, edges: Tuple[NodeId, ...], include_empty: bool):
+        # Sorted so that bit i of a mask always means the i-th smallest
+        # edge id, keeping cut_edges tuples sorted by construction.
+        self._edges = tuple(sorted(edges))
+        self._include_empty = include_empty
+
+    def __len__(self) -> int:
+        n = 2 ** len(self._edges)
+        return n if self._include_empty else n - 1
+
+    def _plan_from_mask(self, mask: int) -> CollapsePlan:
+        # Bit i of `mask` selects self._edges[i]; the plan tuple is built
+        # only here, on demand.
+        edges = self._edges
+        return CollapsePlan(
+            tuple(e for i, e in enumerate(edges) if (mask >> i) & 1)
+        )
+
+    def __iter__(self) -> Iterator[CollapsePlan]:
+        # Integer bitmask iteration: subset enumeration becomes a bare
+        # range() loop with bit tests, no combinations() machinery.
+        # Masks are emitted in Gray-code order (m ^ (m >> 1)), so
+        # consecutive plans differ by exactly one cut edge -- caches keyed
+        # on components (collapser cache, subtree cache) see maximal
+        # overlap between neighbouring plans. Gray coding is a bijection
+        # on [0, 2^k) with g(0) = 0, so skipping m=0 still skips exactly
+        # the empty plan.
+        start = 0 if self._include_empty else 1
+        for m in range(start, 2 ** len(self._edges)):
+            yield self._plan_from_mask(m ^ (m >> 1))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"plan index {index} out of range")
+        # Index maps straight to a mask via the same Gray coding as
+        # __iter__, so random access is O(k) in the edge count rather than
+        # a scan through the enumeration.
+        m = index if self._include_empty else index + 1
+        return self._plan_from_mask(m ^ (m >> 1))
+
+
+# Plan sets depend only on the edge-id tuple, not on node texts, so trees
+# with the same shape (and re-enumerations of the same tree) share one
+# materialized tuple. Only worth paying memory for when 2^k is small.
+_MATERIALIZE_MAX_EDGES = 12
+
+@lru_cache(maxsize=128)
+def _materialized_plans(
+    edges: Tuple[NodeId, ...],
+    include_empty: bool,
+) -> Tuple[CollapsePlan, ...]:
+    # Iterates the lazy sequence, so the order is identical to the
+    # non-materialized path.
+    return tuple(_CollapsePlanSequence(edges, include_empty))
+
+
 def enumerate_collapse_plans(
     toq: ToQ,
     *,
@@ -44,20 +133,17 @@ def enumerate_collapse_plans(
     Enumerate all partial collapses by choosing which edges to cut.
     If the tree has k edges, this returns 2^k plans.
     (Edges are identified by their child node id; i.e., all nodes except root.)
+
+    For small trees the plan tuple is memoized across calls (the set
+    depends only on the edge ids); past _MATERIALIZE_MAX_EDGES edges the
+    returned sequence is lazy, building plans during iteration.
     """
     toq.validate()
 
-    edges: List[NodeId] = [nid for nid in toq.nodes if nid != toq.root_id]  # |edges| = k
-    plans: List[CollapsePlan] = []
-
-    n = len(edges)
-    for r in range(n + 1):
-        if r == 0 and not include_empty:
-            continue
-        for subset in combinations(edges, r):
-            plans.append(CollapsePlan(tuple(sorted(subset))))
-
-    return plans
+    edges: Tuple[NodeId, ...] = tuple(sorted(nid for nid in toq.nodes if nid != toq.root_id))  # |edges| = k
+    if len(edges) <= _MATERIALIZE_MAX_EDGES:
+        return _materialized_plans(edges, include_empty)
+    return _CollapsePlanSequence(edges, include_empty)
 
 
 def component_roots(toq: ToQ, plan: CollapsePlan) -> Tuple[NodeId, ...]:
@@ -65,8 +151,7 @@ def component_roots(toq: ToQ, plan: CollapsePlan) -> Tuple[NodeId, ...]:
     The cut edges define a partition into components.
     The roots (tops) of those components are exactly the union of {root_id} with the cut_edges.
     """
-    roots = set(plan.cut_edges) | {toq.root_id}
-    return tuple(sorted(roots))
+    return tuple(sorted(plan.node_set(toq.root_id)))
 
 
 def _component_root(toq: ToQ, nid: NodeId, cut: Set[NodeId]) -> NodeId:
@@ -93,24 +178,28 @@ def extract_open_toq(toq: ToQ, plan: CollapsePlan, *, root: NodeId) -> OpenToQ:
       These are external leaves: their answers are *not* computed inside the component.
     """
     toq.validate()
-    cut: Set[NodeId] = set(plan.cut_edges)
-    ch = toq.children()
-
-    internal: Set[NodeId] = set()
-    frontier: Set[NodeId] = set()
-
-    stack: List[NodeId] = [root]
-    while stack:
-        u = stack.pop()
-        if u in internal:
-            continue
-        internal.add(u)
-
-        for v in ch.get(u, []):
-            if v in cut:
-                frontier.add(v)     # boundary: external input
-            else:
-                stack.append(v)     # stays internal
+    bit_of, subtree = toq._bitmaps()
+
+    # Component membership via bitsets: start from the root's subtree mask
+    # and strip the subtree of every cut edge below it. Each removal is one
+    # AND-NOT over machine-word chunks; nested cuts are handled for free
+    # (a cut inside an already-removed subtree clears no further bits).
+    mask = subtree[root]
+    for c in plan.cut_edges:
+        if c != root and (mask >> bit_of[c]) & 1:
+            mask &= ~subtree[c]
+
+    internal: Set[NodeId] = {
+        nid for nid, b in bit_of.items() if (mask >> b) & 1
+    }
+
+    # Frontier: cut nodes hanging directly below an internal node. Their
+    # parent bit surviving in `mask` is exactly that condition.
+    frontier: Set[NodeId] = {
+        c
+        for c in plan.cut_edges
+        if c != root and (mask >> bit_of[toq.nodes[c].parent]) & 1
+    }
 
     # Build induced ToQ on internal nodes, keeping original ids/texts.
     # Parent pointers: if a node's parent is outside internal, set parent=None (it becomes root).
@@ -139,7 +228,12 @@ class CollapsedToQ:
     collapsed_question_by_root: Mapping[NodeId, str]
     component_roots: tuple[NodeId, ...]
     open_toq_by_root: Optional[Mapping[NodeId, OpenToQ]] = None
+    removed_mask: Optional[int] = None
     # Quotient ToQ after contracting each component to its root node.
+    # removed_mask is the same removed set as one int, with bit positions
+    # taken from the original ToQ's _bitmaps() enumeration: comparing the
+    # removed sets of two plans over the same tree is then a single int
+    # equality instead of hashing every frozenset element.
 
 def apply_collapse_plan(
     toq: ToQ,
@@ -157,7 +251,7 @@ def apply_collapse_plan(
       - node text is replaced by collapsed_question_by_root[r]
     """
     toq.validate()
-    cut: Set[NodeId] = set(plan.cut_edges)
+    cut: FrozenSet[NodeId] = plan.cut_set()
 
     # Validate cut edges: must be non-root nodes with a parent
     if toq.root_id in cut:
@@ -192,9 +286,19 @@ def apply_collapse_plan(
         )
 
     removed_nodes = frozenset(set(toq.nodes.keys()) - set(roots))
+    bit_of, _ = toq._bitmaps()
+    removed_mask = 0
+    for nid in removed_nodes:
+        removed_mask |= 1 << bit_of[nid]
 
     new_toq = ToQ(nodes=new_nodes, root_id=toq.root_id)
-    new_toq.validate()
+    # Valid by construction: exactly one node has parent=None (the global
+    # root), every rewired parent is itself a component root present in
+    # new_nodes, and contracting subtrees of a validated tree cannot
+    # introduce cycles or orphans. Stamp the memo validate() would set, so
+    # downstream defensive validate() calls cost a dict lookup instead of
+    # a full walk on every one of the 2^E plans.
+    object.__setattr__(new_toq, "_validated", True)
 
     return CollapsedToQ(
         toq=new_toq,
@@ -202,6 +306,7 @@ def apply_collapse_plan(
         removed_nodes=removed_nodes,
         collapsed_question_by_root=collapsed_question_by_root,
         component_roots=roots,
+        removed_mask=removed_mask,
     )
 
 # %%
@@ -19,39 +19,40 @@
 # %autoreload 2
 
 # %%
+import asyncio
+import tempfile
+from collections import Counter
 from typing import Optional
 
+import pytest
+
 from operadic_consistency.core.toq_types import ToQ, ToQNode, OpenToQ
 from operadic_consistency.core.interfaces import Answer
 
-from operadic_consistency.core.consistency import run_consistency_check
+from operadic_consistency.core.consistency import (
+    run_consistency_check,
+    run_consistency_check_async,
+    run_consistency_check_cached,
+)
 
 
 
 # %%
 # ---- tests for core/consistency.py ----
 
-def expect_ok(fn, msg=""):
-    try:
-        fn()
-        print("passed", msg or fn.__name__)
-    except Exception as e:
-        print("FAILED", msg or fn.__name__, "->", type(e).__name__, e)
-
-
 class RecordingCollapser:
     """
     Collapser that records how many times it's called for each OpenToQ boundary.
     Cache keys should be determined by (root_id, inputs).
     """
     def __init__(self):
-        self.calls = []   # list of (root_id, inputs_tuple, context)
-        self.counts = {}  # (root_id, inputs_tuple) -> count
+        self.calls = []          # list of (root_id, inputs_tuple, context)
+        self.counts = Counter()  # (root_id, inputs_tuple) -> count
 
     def __call__(self, open_toq: OpenToQ, *, context: Optional[str] = None) -> str:
         key = (open_toq.root_id, tuple(open_toq.inputs))
         self.calls.append((open_toq.root_id, tuple(open_toq.inputs), context))
-        self.counts[key] = self.counts.get(key, 0) + 1
+        self.counts[key] += 1
         return f"COLLAPSED({open_toq.root_id}|inputs={list(open_toq.inputs)})"
 
 
@@ -63,6 +64,14 @@ class ToyAnswerer:
         return Answer(text=f"ANS({question})")
 
 
+class AsyncToyAnswerer:
+    def __init__(self):
+        self.calls = []
+    async def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
+        self.calls.append((question, context))
+        return Answer(text=f"ANS({question})")
+
+
 def test_runs_count_and_shapes():
     # Tree: 5 nodes, 4 edges
     #
@@ -101,8 +110,7 @@ def test_runs_count_and_shapes():
 
     # Every run should evaluate a collapsed ToQ whose nodes are {root} unioned with the cut_edges
     for run in rep.runs:
-        expected_nodes = set(run.plan.cut_edges) | {toq.root_id}
-        assert set(run.collapsed.toq.nodes.keys()) == expected_nodes
+        assert set(run.collapsed.toq.nodes.keys()) == run.plan.node_set(toq.root_id)
         assert run.root_answer.text == run.trace.answer[toq.root_id].text
 
 def test_frontier_caching_reduces_collapser_calls():
@@ -142,8 +150,179 @@ def test_frontier_caching_reduces_collapser_calls():
     assert len(cache) > 0
 
 
-expect_ok(test_runs_count_and_shapes, "run count + collapsed node sets match")
-expect_ok(test_frontier_caching_reduces_collapser_calls, "frontier caching reduces collapser calls")
-print("consistency.py tests done")
+def test_memoize_answers_dedupes_calls():
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=3),
+        2: ToQNode(2, "Q2?", parent=3),
+        3: ToQNode(3, "Q3([A1],[A2])", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=3)
+
+    plain = ToyAnswerer()
+    rep_plain = run_consistency_check(
+        toq,
+        answerer=plain,
+        collapser=RecordingCollapser(),
+        plan_opts={"include_empty": True},
+        cache={},
+    )
+
+    memoized = ToyAnswerer()
+    rep_memo = run_consistency_check(
+        toq,
+        answerer=memoized,
+        collapser=RecordingCollapser(),
+        plan_opts={"include_empty": True},
+        cache={},
+        memoize_answers=True,
+    )
+
+    # Same answers everywhere, but repeated questions hit the memo
+    assert [r.root_answer.text for r in rep_plain.runs] == [r.root_answer.text for r in rep_memo.runs]
+    assert len(memoized.calls) < len(plain.calls)
+    assert len(memoized.calls) == len({q for q, _ in plain.calls})
+
+
+def test_parallel_evaluation_matches_sequential():
+    # Same tree as above
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=3),
+        2: ToQNode(2, "Q2?", parent=3),
+        3: ToQNode(3, "Q3([A1],[A2])", parent=5),
+        4: ToQNode(4, "Q4?", parent=5),
+        5: ToQNode(5, "Q5([A3],[A4])", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=5)
+    toq.validate()
+
+    rep_seq = run_consistency_check(
+        toq,
+        answerer=ToyAnswerer(),
+        collapser=RecordingCollapser(),
+        plan_opts={"include_empty": True},
+        cache={},
+    )
+    rep_par = run_consistency_check(
+        toq,
+        answerer=ToyAnswerer(),
+        collapser=RecordingCollapser(),
+        plan_opts={"include_empty": True},
+        cache={},
+        max_workers=4,
+    )
+
+    # Plans come back in the same order with the same root answers
+    assert [r.plan.cut_edges for r in rep_seq.runs] == [r.plan.cut_edges for r in rep_par.runs]
+    assert [r.root_answer.text for r in rep_seq.runs] == [r.root_answer.text for r in rep_par.runs]
+
+
+def test_async_run_matches_sync():
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=3),
+        2: ToQNode(2, "Q2?", parent=3),
+        3: ToQNode(3, "Q3([A1],[A2])", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=3)
+
+    rep_sync = run_consistency_check(
+        toq,
+        answerer=ToyAnswerer(),
+        collapser=RecordingCollapser(),
+        plan_opts={"include_empty": True},
+        cache={},
+    )
+    rep_async = asyncio.run(
+        run_consistency_check_async(
+            toq,
+            answerer=AsyncToyAnswerer(),
+            collapser=RecordingCollapser(),
+            plan_opts={"include_empty": True},
+            cache={},
+            max_inflight=2,
+        )
+    )
+
+    assert rep_sync.base_root_answer.text == rep_async.base_root_answer.text
+    assert [r.plan.cut_edges for r in rep_sync.runs] == [r.plan.cut_edges for r in rep_async.runs]
+    assert [r.root_answer.text for r in rep_sync.runs] == [r.root_answer.text for r in rep_async.runs]
+
+
+def test_subtree_cache_requires_sequential():
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=2),
+        2: ToQNode(2, "Q2([A1])", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=2)
+
+    with pytest.raises(ValueError, match="subtree_cache requires sequential"):
+        run_consistency_check(
+            toq,
+            answerer=ToyAnswerer(),
+            collapser=RecordingCollapser(),
+            cache={},
+            subtree_cache={},
+            max_workers=4,
+        )
+
+
+def test_cached_run_skips_recompute():
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=3),
+        2: ToQNode(2, "Q2?", parent=3),
+        3: ToQNode(3, "Q3([A1],[A2])", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=3)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first = ToyAnswerer()
+        rep1 = run_consistency_check_cached(
+            toq,
+            answerer=first,
+            collapser=RecordingCollapser(),
+            cache_dir=cache_dir,
+            plan_opts={"include_empty": True},
+            cache={},
+        )
+        assert len(first.calls) > 0
+
+        # Second run hits the on-disk report; the answerer is never called.
+        second = ToyAnswerer()
+        rep2 = run_consistency_check_cached(
+            toq,
+            answerer=second,
+            collapser=RecordingCollapser(),
+            cache_dir=cache_dir,
+            plan_opts={"include_empty": True},
+            cache={},
+        )
+        assert second.calls == []
+        assert rep2.base_root_answer.text == rep1.base_root_answer.text
+        assert [r.root_answer.text for r in rep2.runs] == [r.root_answer.text for r in rep1.runs]
+
+        # A different tag is a different configuration => recompute
+        third = ToyAnswerer()
+        run_consistency_check_cached(
+            toq,
+            answerer=third,
+            collapser=RecordingCollapser(),
+            tag="other",
+            cache_dir=cache_dir,
+            plan_opts={"include_empty": True},
+            cache={},
+        )
+        assert len(third.calls) > 0
+
+        # A different context is different input data => recompute
+        fourth = ToyAnswerer()
+        run_consistency_check_cached(
+            toq,
+            answerer=fourth,
+            collapser=RecordingCollapser(),
+            cache_dir=cache_dir,
+            context="CONTEXT-B",
+            plan_opts={"include_empty": True},
+            cache={},
+        )
+        assert len(fourth.calls) > 0
 
 # %%
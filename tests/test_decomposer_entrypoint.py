@@ -59,6 +59,12 @@ class TinyDecomposer(QuestionDecomposer):
         return ToQ(nodes=nodes, root_id=2)
 
 
+class BadDecomposer(QuestionDecomposer):
+    def __call__(self, question: str, *, context: Optional[str] = None) -> ToQ:
+        # root_id missing from nodes -> validate() should fail
+        return ToQ(nodes={}, root_id=123)
+
+
 def _root_answers(report) -> list[str]:
     return [run.root_answer.text for run in report.runs]
 
@@ -103,11 +109,6 @@ def test_run_from_question_matches_direct_toq():
 
 
 def test_decomposer_invalid_toq_raises():
-    class BadDecomposer(QuestionDecomposer):
-        def __call__(self, question: str, *, context: Optional[str] = None) -> ToQ:
-            # root_id missing from nodes -> validate() should fail
-            return ToQ(nodes={}, root_id=123)
-
     with pytest.raises(ValueError):
         run_consistency_check_from_question(
             "anything",
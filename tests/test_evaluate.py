@@ -28,13 +28,6 @@ from operadic_consistency.core.evaluate import evaluate_toq
 # %%
 # ---- tests for core/evaluate.py ----
 
-def expect_ok(fn, msg=""):
-    try:
-        fn()
-        print("passed", msg or fn.__name__)
-    except Exception as e:
-        print("FAILED", msg or fn.__name__, "->", type(e).__name__, e)
-
 # A toy answerer that is deterministic and records calls
 class RecordingAnswerer:
     def __init__(self):
@@ -98,9 +91,53 @@ def test_custom_substituter():
     assert tr.rendered_question[2] == "Q2?\nCHILDREN: 1=ANS(Q1?)"
     assert ans.calls == [("Q1?", "CTX"), ("Q2?\nCHILDREN: 1=ANS(Q1?)", "CTX")]
 
-expect_ok(test_leaf_only, "single-node ToQ evaluates")
-expect_ok(test_two_leaves_then_root_substitution, "substitution + postorder works")
-expect_ok(test_custom_substituter, "custom substituter is respected")
-print("evaluate.py tests done")
+# A batched answerer that records each wave of questions it receives
+class RecordingBatchAnswerer:
+    def __init__(self):
+        self.batches = []  # list of (questions_tuple, context)
+
+    def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
+        return self.batch([question], context=context)[0]
+
+    def batch(self, questions, *, context: Optional[str] = None):
+        self.batches.append((tuple(questions), context))
+        return [Answer(text=f"ANS({q})") for q in questions]
+
+def test_batched_answerer_gets_one_call_per_wave():
+    nodes = {
+        1: ToQNode(1, "How old is Michael Jordan?", parent=3),
+        2: ToQNode(2, "How old is Larry Bird?", parent=3),
+        3: ToQNode(3, "If Michael Jordan is [A1] and Larry Bird is [A2], who is older?", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=3)
+
+    ans = RecordingBatchAnswerer()
+    tr = evaluate_toq(toq, answerer=ans, context="ctx")
+
+    # Two waves: both leaves together, then the root
+    assert len(ans.batches) == 2
+    assert set(ans.batches[0][0]) == {"How old is Michael Jordan?", "How old is Larry Bird?"}
+    assert len(ans.batches[1][0]) == 1
+    assert tr.answer[3].text.startswith("ANS(")
+
+def test_subtree_cache_skips_repeat_answers():
+    nodes = {
+        1: ToQNode(1, "How old is Michael Jordan?", parent=3),
+        2: ToQNode(2, "How old is Larry Bird?", parent=3),
+        3: ToQNode(3, "If Michael Jordan is [A1] and Larry Bird is [A2], who is older?", parent=None),
+    }
+    toq = ToQ(nodes=nodes, root_id=3)
+
+    ans = RecordingAnswerer()
+    cache = {}
+
+    tr1 = evaluate_toq(toq, answerer=ans, context="ctx", subtree_cache=cache)
+    assert len(ans.calls) == 3
+
+    # Second evaluation renders identical questions everywhere, so every
+    # answer comes from the cache and the answerer is never called again.
+    tr2 = evaluate_toq(toq, answerer=ans, context="ctx", subtree_cache=cache)
+    assert len(ans.calls) == 3
+    assert tr2.answer[3].text == tr1.answer[3].text
 
 # %%
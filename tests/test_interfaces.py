@@ -20,7 +20,7 @@
 
 # %%
 from operadic_consistency.core.toq_types import NodeId, ToQ, ToQNode
-from operadic_consistency.core.interfaces import Answer
+from operadic_consistency.core.interfaces import Answer, CoalescingAnswerer, MemoAnswerer
 
 # %%
 # ---- tests for core/interfaces.py (runtime sanity) ----
@@ -45,6 +45,82 @@ assert isinstance(cq, str)
 ns = toy_normalizer("  HeLLo  ")
 assert ns == "hello"
 
+# smoke: MemoAnswerer deduplicates repeated (context, question) pairs
+calls = []
+def counting_answerer(q: str, *, context=None) -> Answer:
+    calls.append(q)
+    return Answer(text=f"ans({q})")
+
+memo = MemoAnswerer(counting_answerer)
+a1 = memo("What is 2+2?", context="ctx")
+a2 = memo("What is 2+2?", context="ctx")
+a3 = memo("What is 2+2?", context="other")
+assert a1.text == a2.text
+assert calls == ["What is 2+2?", "What is 2+2?"]  # second call was a memo hit
+assert (memo.hits, memo.misses) == (1, 2)
+
+# smoke: persisted memo entries survive a fresh MemoAnswerer
+import os
+import tempfile
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    path = os.path.join(tmpdir, "answers.jsonl")
+
+    calls2 = []
+    def counting_answerer2(q: str, *, context=None) -> Answer:
+        calls2.append(q)
+        return Answer(text=f"ans({q})")
+
+    memo1 = MemoAnswerer(counting_answerer2, persist_path=path)
+    memo1("What is 2+2?", context="ctx")
+    assert calls2 == ["What is 2+2?"]
+
+    # A brand-new wrapper loads the persisted answer: zero new calls
+    memo2 = MemoAnswerer(counting_answerer2, persist_path=path)
+    a4 = memo2("What is 2+2?", context="ctx")
+    assert a4.text == "ans(What is 2+2?)"
+    assert calls2 == ["What is 2+2?"]
+    assert (memo2.hits, memo2.misses) == (1, 0)
+
+# smoke: Answer.flyweight pools meta-free answers by text
+fa1 = Answer.flyweight("yes")
+fa2 = Answer.flyweight("yes")
+assert fa1 is fa2
+fa3 = Answer.flyweight("yes", meta={"source": "test"})
+assert fa3 is not fa1 and fa3.text == "yes"  # meta-carrying answers are never pooled
+
+# smoke: CoalescingAnswerer lets concurrent duplicate calls share one request
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+release = threading.Event()
+started = threading.Event()
+slow_calls = []
+
+def slow_answerer(q: str, *, context=None) -> Answer:
+    slow_calls.append(q)
+    started.set()
+    release.wait(timeout=5)
+    return Answer(text=f"ans({q})")
+
+co = CoalescingAnswerer(slow_answerer)
+with ThreadPoolExecutor(max_workers=2) as pool:
+    f1 = pool.submit(co, "What is 2+2?", context="ctx")
+    assert started.wait(timeout=5)
+    # Second identical call arrives while the first is still in flight
+    f2 = pool.submit(co, "What is 2+2?", context="ctx")
+    for _ in range(1000):
+        if co.coalesced == 1:
+            break
+        time.sleep(0.005)
+    release.set()
+    a_first, a_second = f1.result(timeout=5), f2.result(timeout=5)
+
+assert slow_calls == ["What is 2+2?"]  # one round-trip served both callers
+assert a_first.text == a_second.text
+assert co.coalesced == 1
+
 print("interfaces runtime smoke tests passed")
 
 # %%
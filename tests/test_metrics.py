@@ -33,13 +33,6 @@ from operadic_consistency.core.metrics import (
 # %%
 # ---- tests for core/metrics.py ----
 
-def expect_ok(fn, msg=""):
-    try:
-        fn()
-        print("passed", msg or fn.__name__)
-    except Exception as e:
-        print("FAILED", msg or fn.__name__, "->", type(e).__name__, e)
-
 # We’ll fabricate a tiny ConsistencyReport with known answers.
 # (This avoids needing to run the whole pipeline.)
 
@@ -124,9 +117,4 @@ def test_entropy_and_witnesses_and_summary():
     assert isinstance(summ["top_answers"], list)
     assert "witness_plans" in summ
 
-
-expect_ok(test_distribution_and_mode_and_agreement, "distribution/mode/agreement")
-expect_ok(test_entropy_and_witnesses_and_summary, "entropy/witnesses/summary")
-print("metrics.py tests done")
-
 # %%
@@ -19,29 +19,19 @@
 # %autoreload 2
 
 # %%
+import pytest
+
 from operadic_consistency.core.toq_types import ToQ, ToQNode
-from operadic_consistency.core.serialization import toq_to_json, toq_from_json
+from operadic_consistency.core.serialization import (
+    toq_to_json,
+    toq_from_json,
+    toq_to_bytes,
+    toq_from_bytes,
+)
 
 # %%
 # ---- tests for serialization.py ----
 
-def expect_ok(fn, msg=""):
-    try:
-        fn()
-        print("passed", msg or fn.__name__)
-    except Exception as e:
-        print("FAILED", msg or fn.__name__, "->", type(e).__name__, e)
-
-
-def expect_fail(fn, msg=""):
-    try:
-        fn()
-        print("FAILED (expected failure)", msg or fn.__name__)
-    except Exception as e:
-        print("passed (expected failure)", msg or fn.__name__)
-        print(" ", type(e).__name__, e)
-
-
 def test_roundtrip_simple():
     nodes = {
         1: ToQNode(1, "Root?", parent=None),
@@ -88,47 +78,80 @@ def test_json_keys_are_strings():
     assert list(j["nodes"].keys()) == ["1"]
 
 
-def test_invalid_missing_fields():
-    bad = {
-        "nodes": {
-            "1": {"id": 1, "text": "Q?", "parent": None}
-        }
-        # missing root_id
+def test_bytes_roundtrip():
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=3),
+        2: ToQNode(2, "Q2?", parent=3),
+        3: ToQNode(3, "Q3([A1],[A2])", parent=None),
     }
+    toq = ToQ(nodes=nodes, root_id=3)
 
-    expect_fail(lambda: toq_from_json(bad), "missing root_id")
+    buf = toq_to_bytes(toq)
+    assert isinstance(buf, bytes)
 
+    toq2 = toq_from_bytes(buf)
+    assert toq2 == toq
 
-def test_invalid_parent_reference():
-    bad = {
-        "root_id": 1,
-        "nodes": {
-            "1": {"id": 1, "text": "Root?", "parent": None},
-            "2": {"id": 2, "text": "Child?", "parent": 99},  # invalid parent
-        },
-    }
+    # bytes path and dict path agree on the wire format
+    assert toq_from_bytes(buf) == toq_from_json(toq_to_json(toq))
 
-    expect_fail(lambda: toq_from_json(bad), "invalid parent id")
 
+def test_msgpack_roundtrip():
+    pytest.importorskip("msgspec")
+    from operadic_consistency.core.serialization import toq_to_msgpack, toq_from_msgpack
 
-def test_node_id_mismatch():
-    bad = {
-        "root_id": 1,
-        "nodes": {
-            "1": {"id": 99, "text": "Q?", "parent": None},
-        },
+    nodes = {
+        1: ToQNode(1, "Q1?", parent=3),
+        2: ToQNode(2, "Q2?", parent=3),
+        3: ToQNode(3, "Q3([A1],[A2])", parent=None),
     }
+    toq = ToQ(nodes=nodes, root_id=3)
 
-    expect_fail(lambda: toq_from_json(bad), "node key != node.id")
-
-
-expect_ok(test_roundtrip_simple, "roundtrip single-node")
-expect_ok(test_roundtrip_nontrivial_tree, "roundtrip multi-node")
-expect_ok(test_json_keys_are_strings, "json keys are strings")
-test_invalid_missing_fields()
-test_invalid_parent_reference()
-test_node_id_mismatch()
-
-print("serialization.py tests done")
+    buf = toq_to_msgpack(toq)
+    assert isinstance(buf, bytes)
+    assert toq_from_msgpack(buf) == toq
+
+
+# Malformed payloads, parametrized so each shape fails (or passes)
+# independently. `match` is checked against the raised ValueError.
+@pytest.mark.parametrize(
+    "bad, match",
+    [
+        pytest.param(
+            {
+                "nodes": {
+                    "1": {"id": 1, "text": "Q?", "parent": None}
+                }
+                # missing root_id
+            },
+            "missing root_id",
+            id="missing-root-id",
+        ),
+        pytest.param(
+            {
+                "root_id": 1,
+                "nodes": {
+                    "1": {"id": 1, "text": "Root?", "parent": None},
+                    "2": {"id": 2, "text": "Child?", "parent": 99},  # invalid parent
+                },
+            },
+            "missing parent 99",
+            id="invalid-parent-reference",
+        ),
+        pytest.param(
+            {
+                "root_id": 1,
+                "nodes": {
+                    "1": {"id": 99, "text": "Q?", "parent": None},
+                },
+            },
+            "!= node.id",
+            id="node-id-mismatch",
+        ),
+    ],
+)
+def test_invalid_json_rejected(bad, match):
+    with pytest.raises(ValueError, match=match):
+        toq_from_json(bad)
 
 # %%
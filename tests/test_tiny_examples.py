@@ -23,6 +23,8 @@
 # %autoreload 2
 
 # %%
+import re
+from functools import lru_cache
 from typing import Optional
 
 from operadic_consistency.core.toq_types import ToQ, ToQNode, OpenToQ
@@ -44,26 +46,37 @@ from operadic_consistency.core.consistency import run_consistency_check
 from operadic_consistency.core.transforms import OpenToQ
 
 
+# One compiled alternation + answer table instead of four sequential
+# substring scans per call; the patterns never overlap in this demo, so
+# leftmost-match dispatch is equivalent to the old if-chain.
+_TINY_PATTERN = re.compile(
+    r"when did ww2 end|president at time|president when ww2 ended|wife"
+)
+_TINY_ANSWERS = {
+    "when did ww2 end": "1945",
+    "president at time": "Harry Truman",
+    "president when ww2 ended": "Harry Truman",
+    "wife": "Bess Truman",
+}
+
+
+@lru_cache(maxsize=256)
+def _tiny_answer(question_lower: str) -> Answer:
+    # Different collapse plans re-render identical questions; memoizing on
+    # the lowered text means each distinct question is scanned once per
+    # session (Answer is frozen, so sharing instances is safe).
+    m = _TINY_PATTERN.search(question_lower)
+    if m is None:
+        return Answer("UNKNOWN")
+    return Answer(_TINY_ANSWERS[m.group(0)])
+
+
 class TinyAnswerer:
     """
     Deterministic toy answerer for demonstrations.
     """
     def __call__(self, question: str, *, context: Optional[str] = None) -> Answer:
-        q = question.lower()
-
-        if "when did ww2 end" in q:
-            return Answer("1945")
-
-        if "president at time" in q:
-            return Answer("Harry Truman")
-
-        if "president when ww2 ended" in q:
-            return Answer("Harry Truman")
-
-        if "wife" in q:
-            return Answer("Bess Truman")
-
-        return Answer("UNKNOWN")
+        return _tiny_answer(question.lower())
 
 
 class TinyCollapser:
@@ -80,11 +93,13 @@ class TinyCollapser:
             return root_text
 
         # Closed component => we can fuse (toy logic, specific to this demo)
-        # If we see the 2-node WW2->President chain, fuse to a nicer question:
-        texts = {n.text for n in open_toq.toq.nodes.values()}
+        # If we see the 2-node WW2->President chain, fuse to a nicer question.
+        # Membership scans short-circuit on first match instead of building
+        # a throwaway set per call (the collapser runs once per plan).
+        node_values = open_toq.toq.nodes.values()
         if (
-            "When did WW2 end?" in texts
-            and "Who was President at time [A1]?" in texts
+            any(n.text == "When did WW2 end?" for n in node_values)
+            and any(n.text == "Who was President at time [A1]?" for n in node_values)
             and open_toq.root_id in open_toq.toq.nodes
         ):
             return "Who was President when WW2 ended?"
@@ -99,7 +114,8 @@ class TinyCollapser:
 
 def print_toq(toq: ToQ, title: str):
     print(f"\n=== {title} ===")
-    for nid, node in sorted(toq.nodes.items()):
+    for nid in toq.sorted_ids():
+        node = toq.nodes[nid]
         print(f"Node {nid}:")
         print(f"  text   = {node.text}")
         print(f"  parent = {node.parent}")
@@ -121,7 +137,8 @@ def print_consistency_report(report):
         print(f"cut_edges = {run.plan.cut_edges}")
 
         print("collapsed ToQ nodes:")
-        for nid, node in sorted(run.collapsed.toq.nodes.items()):
+        for nid in run.collapsed.toq.sorted_ids():
+            node = run.collapsed.toq.nodes[nid]
             print(f"  Node {nid}: parent={node.parent}, text={node.text}")
 
         print(f"root answer = {run.root_answer.text}")
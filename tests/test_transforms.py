@@ -33,22 +33,6 @@ from operadic_consistency.core.transforms import (
 # %%
 # ---- tests for core/transforms.py ----
 
-def expect_ok(fn, msg=""):
-    try:
-        fn()
-        print("passed", msg or fn.__name__)
-    except Exception as e:
-        print("failed", msg or fn.__name__, "->", type(e).__name__, e)
-
-def expect_fail(fn, msg=""):
-    try:
-        fn()
-        print("expected failure but passed:", msg or fn.__name__)
-    except Exception as e:
-        print("expected failure:", msg or fn.__name__)
-        print("  ", type(e).__name__, e)
-
-
 # A small ToQ: root(3) with children (1,2)
 nodes = {
     1: ToQNode(1, "Q1?", parent=3),
@@ -58,28 +42,25 @@ nodes = {
 toq = ToQ(nodes=nodes, root_id=3)
 toq.validate()
 
+p_empty = CollapsePlan(())
+p_cut1 = CollapsePlan((1,))
+p_cut12 = CollapsePlan((1, 2))
+
 # --- 1) enumeration count ---
-plans = enumerate_collapse_plans(toq, include_empty=True)
-print("num edges =", len(nodes) - 1)
-print("num plans =", len(plans))
-assert len(plans) == 2 ** (len(nodes) - 1)  # 2^k, k = #edges
+def test_enumeration_count_and_extremes():
+    plans = enumerate_collapse_plans(toq, include_empty=True)
+    assert len(plans) == 2 ** (len(nodes) - 1)  # 2^k, k = #edges
 
-# check empty and full cuts exist
-cut_sets = {p.cut_edges for p in plans}
-assert () in cut_sets
-assert tuple(sorted([1, 2])) in cut_sets
-print("passed; enumeration includes empty and full cut")
+    # check empty and full cuts exist
+    cut_sets = {p.cut_edges for p in plans}
+    assert () in cut_sets
+    assert tuple(sorted([1, 2])) in cut_sets
 
 # --- 2) component_roots correctness ---
-p_empty = CollapsePlan(())
-assert set(component_roots(toq, p_empty)) == {3}
-
-p_cut1 = CollapsePlan((1,))
-assert set(component_roots(toq, p_cut1)) == {3, 1}
-
-p_cut12 = CollapsePlan((1, 2))
-assert set(component_roots(toq, p_cut12)) == {3, 1, 2}
-print("passed; component_roots behaves")
+def test_component_roots():
+    assert set(component_roots(toq, p_empty)) == {3}
+    assert set(component_roots(toq, p_cut1)) == {3, 1}
+    assert set(component_roots(toq, p_cut12)) == {3, 1, 2}
 
 # --- 3) apply_collapse_plan structure ---
 def test_apply_empty():
@@ -90,8 +71,7 @@ def test_apply_empty():
     assert ct.toq.nodes[3].parent is None
     assert ct.toq.nodes[3].text == "C(3)"
     assert ct.removed_nodes == frozenset({1, 2})
-
-expect_ok(test_apply_empty, "apply empty cut collapses everything to root")
+    assert ct.removed_mask == 0b011  # bits follow the original node order (1, 2, 3)
 
 def test_apply_cut1():
     cq = {3: "C(3)", 1: "C(1)"}  # components: root and node1
@@ -103,8 +83,7 @@ def test_apply_cut1():
     assert ct.toq.nodes[1].text == "C(1)"
     assert ct.toq.nodes[3].text == "C(3)"
     assert ct.removed_nodes == frozenset({2})
-
-expect_ok(test_apply_cut1, "apply cut {1} yields quotient nodes {3,1}")
+    assert ct.removed_mask == 0b010
 
 def test_apply_cut12():
     cq = {3: "C(3)", 1: "C(1)", 2: "C(2)"}
@@ -114,8 +93,7 @@ def test_apply_cut12():
     assert ct.toq.nodes[1].parent == 3
     assert ct.toq.nodes[2].parent == 3
     assert ct.removed_nodes == frozenset()  # all nodes are component roots
-
-expect_ok(test_apply_cut12, "apply cut {1,2} keeps all nodes but replaces texts")
+    assert ct.removed_mask == 0
 
 # --- 4) failure modes ---
 def test_missing_collapsed_question():
@@ -135,6 +113,4 @@ def test_invalid_cut_nonexistent():
     with pytest.raises(ValueError, match="node 99 not in ToQ"):
         apply_collapse_plan(toq, bad_plan, cq)
 
-print("transforms.py tests done")
-
 # %%